@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+build_dof_cffi.py — build _dof_cffi, the optional cffi API-mode extension.
+
+The extension is a real C module that calls dof_data_receive() directly,
+so dof.data_receive() skips the ctypes / cffi ABI-mode argument parsing on
+every event.  dof.py picks it up automatically when it is importable and
+falls back to cffi ABI mode or ctypes otherwise.
+
+Run after libdof_python has been built (build_wrapper.sh does this for you):
+    python3 build_dof_cffi.py
+
+Requires cffi and a C compiler matching the running Python.
+"""
+
+import os
+import sys
+
+import cffi
+
+from dof import _CFFI_CDEF
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+if sys.platform.startswith('win'):
+    _libraries = ['libdof_python']
+    _link_args: list[str] = []
+elif sys.platform == 'darwin':
+    _libraries = ['dof_python']
+    _link_args = ['-Wl,-rpath,@loader_path']
+else:
+    _libraries = ['dof_python']
+    _link_args = ['-Wl,-rpath,$ORIGIN']
+
+ffi = cffi.FFI()
+ffi.cdef(_CFFI_CDEF)
+ffi.set_source(
+    '_dof_cffi',
+    '#include "dof_c_api.h"',
+    libraries=_libraries,
+    include_dirs=[HERE],
+    library_dirs=[HERE],
+    extra_link_args=_link_args,
+)
+
+
+if __name__ == '__main__':
+    ffi.compile(tmpdir=HERE, verbose=True)
@@ -60,6 +60,18 @@ g++ -shared -fPIC -std=c++17 \
 
 echo ""
 echo "=== Success: libdof_python.so built ==="
+
+# Optional: cffi API-mode extension for a faster data_receive() path
+PYTHON="${PYTHON:-python3}"
+if "${PYTHON}" -c 'import cffi' 2>/dev/null; then
+    echo ""
+    echo "=== Building _dof_cffi extension ==="
+    "${PYTHON}" build_dof_cffi.py \
+        || echo "warning: _dof_cffi build failed; dof.py will use cffi ABI mode / ctypes"
+else
+    echo ""
+    echo "cffi not installed for ${PYTHON}; skipping the optional _dof_cffi extension."
+fi
 echo ""
 echo "Make sure libdof.so (and its runtime deps) are findable at load time:"
 echo "  export LD_LIBRARY_PATH=\"${LIBDOF_BUILD}:\$LD_LIBRARY_PATH\""
@@ -4,6 +4,14 @@ dof.py — Python wrapper for libdof (https://github.com/jsm174/libdof)
 Requires libdof_python shared library built from dof_c_api.cpp
 (`.so` on Linux, `.dylib` on macOS, `.dll` on Windows).
 
+If cffi is installed it is used for the per-event data_receive() call, which
+is noticeably cheaper than ctypes at high event rates; otherwise everything
+goes through ctypes.  Building the _dof_cffi extension (build_dof_cffi.py)
+removes the remaining per-call dispatch cost.
+
+Every binding releases the GIL while libdof runs, so one thread can feed
+events while others keep running Python.
+
 Quick start:
     import dof
 
@@ -18,13 +26,23 @@ Quick start:
         # finish() is called automatically on context-manager exit
 """
 
+import atexit
 import ctypes
 import ctypes.util
+import functools
 import os
 import sys
+import threading
+import types
+import weakref
 from enum import IntEnum
 from typing import Callable, Optional
 
+try:
+    import cffi
+except ImportError:               # Optional: the ctypes event path is used instead
+    cffi = None
+
 
 # ---------------------------------------------------------------------------
 # Public constants
@@ -37,16 +55,101 @@ class LogLevel(IntEnum):
     DEBUG = 3
 
 
+class DofEvent(ctypes.Structure):
+    """
+    One event for DOF.data_receive_many(); mirrors DofEvent in dof_c_api.h.
+
+    numpy.dtype(dof.DofEvent) gives the matching NumPy structured dtype.
+    """
+    _fields_ = [
+        ('type',   ctypes.c_char),
+        ('number', ctypes.c_int32),
+        ('value',  ctypes.c_int32),
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Internal ctypes state (module-level singleton pattern mirrors C singleton)
 # ---------------------------------------------------------------------------
 
 _lib: Optional[ctypes.CDLL] = None
-_log_callback_ref = None          # Prevent the ctypes wrapper from being GC'd
+
+# Current log callback as (callable_or_weakref, is_weak); read by _dispatch_log
+_log_target: tuple = (None, False)
+
+# Buffered logging: libdof queues messages in C and this thread delivers them
+_log_drain_thread: Optional[threading.Thread] = None
+_log_drain_stop: Optional[threading.Event] = None
+_LOG_DRAIN_INTERVAL = 0.01        # Seconds between queue polls
+_LOG_DRAIN_BATCH = 64             # Records fetched per dof_log_drain() call
+_LOG_MESSAGE_MAX = 512            # DOF_LOG_MESSAGE_MAX in dof_c_api.h
+
+# Fastest available binding of dof_data_receive().  ctypes handles every other
+# (cold) call; when cffi is installed the per-event call goes through cffi,
+# whose argument marshalling is considerably cheaper than ctypes'.
+_data_receive = None
+_ffi = None                       # cffi.FFI instance when the cffi path is active
+_cffi_lib = None                  # Keep the cffi library object alive
+
+_numpy_event_dtype = None         # numpy.dtype(DofEvent), built on first NumPy batch
+
+_CFFI_CDEF = """
+    void dof_data_receive(void *dof, char type, int number, int value);
+"""
+
+# Preallocated one-byte type characters indexed by ASCII code, so the raw
+# event path never builds a bytes object per call.
+_TYPE_BYTES = tuple(bytes((code,)) for code in range(256))
+
+# The same bytes keyed by code: a dict, unlike the tuple, raises KeyError for
+# negative codes instead of silently indexing from the end.
+_CODE_BYTES = dict(enumerate(_TYPE_BYTES))
+
+# ASCII str and one-byte bytes type characters mapped to the same bytes.
+_STR_BYTES = {chr(code): _TYPE_BYTES[code] for code in range(128)}
+_BYTE_BYTES = {byte: byte for byte in _TYPE_BYTES}
+
+# One table per accepted type_char type, so data_receive() does no per-call
+# encoding.  Selecting by exact type keeps 83.0 or True from matching the int
+# key 83 / 1 (dict keys compare by value); those take the slow path instead.
+_TYPE_CHAR_TABLES = {str: _STR_BYTES, bytes: _BYTE_BYTES, int: _CODE_BYTES}
+
+
+class _LogRecord(ctypes.Structure):
+    """Mirrors DofLogRecord in dof_c_api.h."""
+    _fields_ = [
+        ('level',   ctypes.c_int),
+        ('message', ctypes.c_char * _LOG_MESSAGE_MAX),
+    ]
+
 
 # ctypes function type for the C-level log callback
 _LogCallbackType = ctypes.CFUNCTYPE(None, ctypes.c_int, ctypes.c_char_p)
 
+# Plain dict lookup instead of calling the LogLevel enum for every message
+_LOG_LEVELS = {int(level): level for level in LogLevel}
+
+
+def _dispatch_log(level_int: int, raw_msg: Optional[bytes]) -> None:
+    """Deliver one libdof log message to the current _log_target."""
+    target, weak = _log_target
+    callback = target() if weak else target
+    if callback is None:
+        return
+    level = _LOG_LEVELS.get(level_int)
+    message = raw_msg.decode('utf-8', 'replace') if raw_msg else ''
+    try:
+        callback(level if level is not None else LogLevel(level_int), message)
+    except Exception as exc:
+        # Never let Python exceptions propagate into C code
+        print(f'[dof.py] log callback raised: {exc}')
+
+
+# The one C trampoline handed to libdof.  It lives for the whole process, so
+# swapping callbacks only rebinds _log_target and a libdof thread that is
+# mid-call never sees its trampoline freed underneath it.
+_log_trampoline = _LogCallbackType(_dispatch_log)
+
 
 def _library_candidates(script_dir: str) -> list[str]:
     """Return platform-appropriate shared library candidates."""
@@ -75,6 +178,7 @@ def _load_lib(lib_path: Optional[str] = None) -> ctypes.CDLL:
         return _lib
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    explicit_path = lib_path
     if lib_path is None:
         candidates = _library_candidates(script_dir)
         for c in candidates:
@@ -89,11 +193,76 @@ def _load_lib(lib_path: Optional[str] = None) -> ctypes.CDLL:
         )
 
     _prepare_windows_dll_search(script_dir)
-    _lib = ctypes.CDLL(lib_path)
-    _setup_api(_lib)
+    # CDLL rather than PyDLL: ctypes releases the GIL for every foreign call,
+    # as cffi does, so DOF calls never block other Python threads.
+    lib = ctypes.CDLL(lib_path)
+    _setup_api(lib)
+    _bind_data_receive(lib, lib_path, try_extension=explicit_path is None)
+    _lib = lib
     return _lib
 
 
+def _bind_data_receive(lib: ctypes.CDLL, lib_path: str, try_extension: bool) -> None:
+    """
+    Pick the cheapest dof_data_receive() binding available, in order:
+    the compiled _dof_cffi extension (see build_dof_cffi.py), cffi ABI mode,
+    then ctypes.
+
+    The extension links against the libdof_python next to it, so it is only
+    used when the library was auto-discovered rather than passed explicitly.
+    """
+    global _data_receive, _ffi, _cffi_lib
+    if try_extension:
+        try:
+            from _dof_cffi import ffi, lib as cffi_lib
+        except ImportError:
+            pass
+        else:
+            _ffi, _cffi_lib = ffi, cffi_lib
+            _data_receive = cffi_lib.dof_data_receive
+            return
+    if cffi is not None:
+        ffi = cffi.FFI()
+        ffi.cdef(_CFFI_CDEF)
+        try:
+            cffi_lib = ffi.dlopen(lib_path)
+        except OSError:
+            pass
+        else:
+            _ffi, _cffi_lib = ffi, cffi_lib
+            _data_receive = cffi_lib.dof_data_receive
+            return
+    _data_receive = _checked_ctypes_receive(lib.dof_data_receive)
+
+
+_C_INT_MAX = 2 ** (ctypes.sizeof(ctypes.c_int) * 8 - 1) - 1
+_C_INT_MIN = -_C_INT_MAX - 1
+
+
+def _checked_ctypes_receive(c_receive):
+    """
+    Wrap ctypes' dof_data_receive so number / value outside the C int range
+    raise OverflowError, as cffi does, instead of silently wrapping around.
+    """
+    def receive(handle, type_char: bytes, number: int, value: int) -> None:
+        if not (_C_INT_MIN <= number <= _C_INT_MAX and _C_INT_MIN <= value <= _C_INT_MAX):
+            raise OverflowError(f"number / value must fit in a C int, got {number}, {value}")
+        c_receive(handle, type_char, number, value)
+    return receive
+
+
+def _event_handle(handle: int):
+    """Convert a dof_create() handle into the form _data_receive expects."""
+    if _ffi is not None:
+        return _ffi.cast('void *', handle)
+    return handle
+
+
+def _destroyed_receive(*_args) -> None:
+    """Stand-in for a destroyed instance's bound receive call."""
+    raise RuntimeError("DOF instance has been destroyed.")
+
+
 def _setup_api(lib: ctypes.CDLL) -> None:
     """Declare argtypes / restype for every C function we expose."""
 
@@ -107,6 +276,12 @@ def _setup_api(lib: ctypes.CDLL) -> None:
     lib.dof_config_set_log_callback.restype  = None
     lib.dof_config_set_log_callback.argtypes = [ctypes.c_void_p]
 
+    lib.dof_config_set_log_queue.restype  = None
+    lib.dof_config_set_log_queue.argtypes = [ctypes.c_int]
+
+    lib.dof_log_drain.restype  = ctypes.c_size_t
+    lib.dof_log_drain.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+
     # --- Lifecycle ---
     lib.dof_create.restype  = ctypes.c_void_p
     lib.dof_create.argtypes = []
@@ -122,6 +297,10 @@ def _setup_api(lib: ctypes.CDLL) -> None:
     lib.dof_data_receive.argtypes = [ctypes.c_void_p, ctypes.c_char,
                                       ctypes.c_int, ctypes.c_int]
 
+    lib.dof_data_receive_batch.restype  = None
+    lib.dof_data_receive_batch.argtypes = [ctypes.c_void_p, ctypes.c_void_p,
+                                            ctypes.c_size_t]
+
     lib.dof_finish.restype  = None
     lib.dof_finish.argtypes = [ctypes.c_void_p]
 
@@ -173,6 +352,8 @@ def set_log_level(level: LogLevel, lib_path: Optional[str] = None) -> None:
 def set_log_callback(
     callback: Optional[Callable[[LogLevel, str], None]],
     lib_path: Optional[str] = None,
+    buffered: bool = False,
+    weak: bool = False,
 ) -> None:
     """
     Register a Python function to receive log messages from libdof.
@@ -180,30 +361,167 @@ def set_log_callback(
 
     The callback signature is:  callback(level: LogLevel, message: str)
 
+    By default the callback runs on whichever libdof thread logged the
+    message.  With buffered=True, libdof instead queues messages in C and a
+    background thread delivers them in batches every few milliseconds, so
+    chatty (DEBUG) logging never stalls libdof waiting for Python.
+    Queued messages are truncated to 511 bytes and are flushed when the
+    callback is replaced and at interpreter exit.
+
+    With weak=True only a weak reference to the callback is kept (a
+    WeakMethod for bound methods), so e.g. an object's log method stops
+    receiving messages once the object is garbage collected.
+
     Example:
         def my_log(level, msg):
             print(f'[{level.name}] {msg}')
 
         dof.set_log_callback(my_log)
     """
-    global _log_callback_ref
+    global _log_target
+    # Build the new target first so a bad callback leaves logging untouched
+    if callback is None:
+        target = (None, False)
+    elif weak:
+        # A bound builtin method (e.g. sys.stdout.write) is a fresh object on
+        # every attribute access, so a weakref to it would die immediately.
+        bound_builtin = (isinstance(callback, types.BuiltinMethodType)
+                         and not isinstance(callback.__self__, types.ModuleType))
+        try:
+            if bound_builtin:
+                raise TypeError
+            if isinstance(callback, types.MethodType):
+                target = (weakref.WeakMethod(callback), True)
+            else:
+                target = (weakref.ref(callback), True)
+        except TypeError:
+            raise TypeError(
+                f'weak=True needs a weakly referenceable callback, got {callback!r}'
+            ) from None
+    else:
+        target = (callback, False)
+
     lib = _load_lib(lib_path)
+    _stop_log_drain()
+    _log_target = target
 
     if callback is None:
-        _log_callback_ref = None
         lib.dof_config_set_log_callback(None)
         return
 
-    def _c_callback(level_int: int, raw_msg: bytes) -> None:
-        try:
-            callback(LogLevel(level_int),
-                     raw_msg.decode('utf-8', errors='replace') if raw_msg else '')
-        except Exception as exc:
-            # Never let Python exceptions propagate into C code
-            print(f'[dof.py] log callback raised: {exc}')
+    if buffered:
+        lib.dof_config_set_log_callback(None)
+        _start_log_drain(lib)
+    else:
+        lib.dof_config_set_log_callback(_log_trampoline)
+
+
+def set_log_callback_raw(address: int, lib_path: Optional[str] = None) -> None:
+    """
+    Register a native log callback by address, bypassing the Python
+    trampoline entirely.  Pass 0 to disable the callback.
+
+    address must point to a C function with the DofLogCallbackC signature
+    from dof_c_api.h, void (*)(DofLogLevel level, const char* message),
+    e.g. a Cython cdef function or a Numba cfunc's .address.  It runs on
+    libdof's threads and must stay valid while registered.
+    """
+    global _log_target
+    lib = _load_lib(lib_path)
+    _stop_log_drain()
+    _log_target = (None, False)
+    lib.dof_config_set_log_callback(address or None)
+
+
+def pack_events(events) -> ctypes.Array:
+    """
+    Pack (type_char, number, value) tuples into a DofEvent array for
+    DOF.data_receive_many().  Pack a fixed sequence once and reuse the array.
+
+    type_char accepts the same forms as DOF.data_receive().
+    """
+    packed = [(_type_char_bytes(t), n, v) for t, n, v in events]
+    return (DofEvent * len(packed))(*packed)
+
 
-    _log_callback_ref = _LogCallbackType(_c_callback)
-    lib.dof_config_set_log_callback(_log_callback_ref)
+def _event_dtype():
+    """numpy.dtype(DofEvent); NumPy is only imported once an array is passed."""
+    global _numpy_event_dtype
+    if _numpy_event_dtype is None:
+        import numpy
+        _numpy_event_dtype = numpy.dtype(DofEvent)
+    return _numpy_event_dtype
+
+
+def _type_char_bytes(type_char: 'str | bytes | int') -> bytes:
+    try:
+        return _TYPE_CHAR_TABLES[type_char.__class__][type_char]
+    except (KeyError, TypeError):
+        return _encode_type_char(type_char)
+
+
+def _encode_type_char(type_char: 'str | bytes | int') -> bytes:
+    """Slow path for type_char values missing from _TYPE_CHAR_TABLES."""
+    if isinstance(type_char, str):
+        type_char = type_char.encode()
+    elif isinstance(type_char, int):
+        return bytes([type_char])
+    else:
+        type_char = bytes(type_char)        # bytearray, memoryview, ...
+    if len(type_char) == 1:
+        return _TYPE_BYTES[type_char[0]]
+    return type_char
+
+
+def _start_log_drain(lib: ctypes.CDLL) -> None:
+    global _log_drain_thread, _log_drain_stop
+    _log_drain_stop = threading.Event()
+    _log_drain_thread = threading.Thread(
+        target=_log_drain_main,
+        args=(lib, _log_drain_stop),
+        name='dof-log-drain',
+        daemon=True,
+    )
+    lib.dof_config_set_log_queue(1)
+    _log_drain_thread.start()
+
+
+def _stop_log_drain() -> None:
+    """Stop queueing log messages and deliver the ones already queued."""
+    global _log_drain_thread, _log_drain_stop
+    if _log_drain_thread is None:
+        return
+    _lib.dof_config_set_log_queue(0)
+    _log_drain_stop.set()
+    if _log_drain_thread is not threading.current_thread():
+        _log_drain_thread.join()
+    _log_drain_thread = _log_drain_stop = None
+
+
+def _shutdown_logging() -> None:
+    """Flush queued messages and detach Python from libdof's logger."""
+    global _log_target
+    _stop_log_drain()
+    if _lib is not None and _log_target[0] is not None:
+        _lib.dof_config_set_log_callback(None)
+    _log_target = (None, False)
+
+
+atexit.register(_shutdown_logging)
+
+
+def _log_drain_main(lib: ctypes.CDLL, stop_event: threading.Event) -> None:
+    records = (_LogRecord * _LOG_DRAIN_BATCH)()
+    while True:
+        stopping = stop_event.wait(_LOG_DRAIN_INTERVAL)
+        while True:
+            count = lib.dof_log_drain(records, _LOG_DRAIN_BATCH)
+            for rec in records[:count]:
+                _dispatch_log(rec.level, rec.message)
+            if count < _LOG_DRAIN_BATCH:
+                break
+        if stopping:
+            return
 
 
 # ---------------------------------------------------------------------------
@@ -235,11 +553,18 @@ class DOF:
         d.destroy()
     """
 
+    # Fixed attribute layout: faster attribute loads on the per-event path
+    __slots__ = ('_lib', '_handle', '_c_recv', '__weakref__')
+
     def __init__(self, lib_path: Optional[str] = None) -> None:
         self._lib = _load_lib(lib_path)
         self._handle: Optional[int] = self._lib.dof_create()
         if not self._handle:
             raise RuntimeError("dof_create() returned NULL")
+        # dof_data_receive with the handle pre-bound: the per-event path is a
+        # single call with no handle check or library attribute lookups.
+        # destroy() swaps it for _destroyed_receive.
+        self._c_recv = functools.partial(_data_receive, _event_handle(self._handle))
 
     # ------------------------------------------------------------------
     # Core operations
@@ -281,13 +606,67 @@ class DOF:
                        the raw ASCII integer.
             number:    Element number (table-specific).
             value:     0 = off, 1 = on, or an analogue level 0-255.
+
+        number and value must fit in a C int; larger values raise
+        OverflowError with every binding.
+
+        This dispatches on the type of type_char; when the type is known,
+        send_str(), send_byte() or send_code() skip that work.
+        """
+        try:
+            type_byte = _TYPE_CHAR_TABLES[type_char.__class__][type_char]
+        except (KeyError, TypeError):
+            type_byte = _encode_type_char(type_char)
+        self._c_recv(type_byte, number, value)
+
+    def data_receive_raw(self, type_byte: int, number: int, value: int) -> None:
+        """
+        Hot-path variant of data_receive() for high event rates.
+
+        Skips the type dispatch of data_receive(): type_byte must be the
+        ASCII code of the element type, e.g. ord('S').  Prefer this in
+        tight loops; data_receive() is a convenience wrapper around the
+        same C call.  A type_byte outside 0-255 raises KeyError.
+        """
+        self._c_recv(_CODE_BYTES[type_byte], number, value)
+
+    # Same call as data_receive_raw(), named to match send_str()/send_byte()
+    send_code = data_receive_raw
+
+    def send_str(self, type_char: str, number: int, value: int) -> None:
+        """data_receive() for a single ASCII character str, e.g. 'S'."""
+        self._c_recv(_STR_BYTES[type_char], number, value)
+
+    def send_byte(self, type_char: bytes, number: int, value: int) -> None:
+        """data_receive() for a one-byte bytes object, e.g. b'S'."""
+        self._c_recv(type_char, number, value)
+
+    def data_receive_many(self, events) -> None:
+        """
+        Send several game events to DOF with a single call into the library.
+        Events are applied in order, exactly as repeated data_receive() calls.
+
+        Args:
+            events: One of
+                      - a DofEvent array from pack_events() (cheapest; reusable)
+                      - a C-contiguous NumPy array of dtype numpy.dtype(dof.DofEvent)
+                      - an iterable of (type_char, number, value) tuples
         """
         self._require_handle()
-        if isinstance(type_char, str):
-            type_char = type_char.encode()
-        elif isinstance(type_char, int):
-            type_char = bytes([type_char])
-        self._lib.dof_data_receive(self._handle, type_char, number, value)
+        if isinstance(events, ctypes.Array) and events._type_ is DofEvent:
+            buf, count = events, len(events)
+        elif hasattr(events, '__array_interface__'):
+            if (events.dtype != _event_dtype()
+                    or not events.flags['C_CONTIGUOUS']):
+                raise ValueError(
+                    "NumPy event arrays must be C-contiguous with dtype numpy.dtype(dof.DofEvent)"
+                )
+            buf, count = events.ctypes.data, events.size
+        else:
+            buf = pack_events(events)
+            count = len(buf)
+        if count:
+            self._lib.dof_data_receive_batch(self._handle, buf, count)
 
     def finish(self) -> None:
         """
@@ -302,6 +681,7 @@ class DOF:
         if self._handle:
             self._lib.dof_destroy(self._handle)
             self._handle = None
+            self._c_recv = _destroyed_receive
 
     # ------------------------------------------------------------------
     # Context-manager support
@@ -13,7 +13,9 @@
 #include <cstdarg>
 #include <cstdio>
 #include <cstdlib>
+#include <atomic>
 #include <cstring>
+#include <mutex>
 
 /* ------------------------------------------------------------------ */
 /* Internal log forwarding                                             */
@@ -21,6 +23,35 @@
 
 static DofLogCallbackC g_log_callback = nullptr;
 
+/* Log ring buffer for dof_config_set_log_queue() / dof_log_drain().
+ * g_log_queue_enabled is only changed under g_log_queue_mutex and rechecked
+ * there before enqueueing, so nothing is queued once queueing is off. */
+static const size_t LOG_QUEUE_CAPACITY = 1024;
+
+static std::mutex        g_log_queue_mutex;
+static std::atomic<bool> g_log_queue_enabled{false};
+static DofLogRecord g_log_queue[LOG_QUEUE_CAPACITY];
+static size_t       g_log_queue_head    = 0;   /* next record to drain */
+static size_t       g_log_queue_count   = 0;
+static size_t       g_log_queue_dropped = 0;
+
+static void queue_log_message(DOF_LogLevel level, const char* format, va_list args)
+{
+    std::lock_guard<std::mutex> lock(g_log_queue_mutex);
+    if (!g_log_queue_enabled)
+        return;
+    if (g_log_queue_count == LOG_QUEUE_CAPACITY) {
+        ++g_log_queue_dropped;
+        return;
+    }
+    DofLogRecord& rec =
+        g_log_queue[(g_log_queue_head + g_log_queue_count) % LOG_QUEUE_CAPACITY];
+    rec.level = static_cast<int>(level);
+    if (vsnprintf(rec.message, sizeof(rec.message), format, args) < 0)
+        rec.message[0] = '\0';
+    ++g_log_queue_count;
+}
+
 /**
  * Native DOF log callback (receives printf-style format + va_list).
  * We format the message here and forward a plain string to the Python
@@ -30,6 +61,13 @@ static void internal_log_callback(DOF_LogLevel level,
                                    const char*  format,
                                    va_list      args)
 {
+    if (g_log_queue_enabled) {
+        va_list args_copy;
+        va_copy(args_copy, args);
+        queue_log_message(level, format, args_copy);
+        va_end(args_copy);
+    }
+
     if (!g_log_callback)
         return;
 
@@ -69,15 +107,53 @@ void dof_config_set_log_level(DofLogLevel level)
     DOF::Config::GetInstance()->SetLogLevel(static_cast<DOF_LogLevel>(level));
 }
 
-void dof_config_set_log_callback(DofLogCallbackC callback)
+static void update_native_log_callback()
 {
-    g_log_callback = callback;
-    if (callback)
+    if (g_log_callback || g_log_queue_enabled)
         DOF::Config::GetInstance()->SetLogCallback(internal_log_callback);
     else
         DOF::Config::GetInstance()->SetLogCallback(nullptr);
 }
 
+void dof_config_set_log_callback(DofLogCallbackC callback)
+{
+    g_log_callback = callback;
+    update_native_log_callback();
+}
+
+void dof_config_set_log_queue(int enabled)
+{
+    {
+        std::lock_guard<std::mutex> lock(g_log_queue_mutex);
+        if (enabled && !g_log_queue_enabled) {
+            /* Start clean: never hand a new drainer an old callback's records */
+            g_log_queue_head = g_log_queue_count = g_log_queue_dropped = 0;
+        }
+        g_log_queue_enabled = enabled != 0;
+    }
+    update_native_log_callback();
+}
+
+size_t dof_log_drain(DofLogRecord* out, size_t max)
+{
+    std::lock_guard<std::mutex> lock(g_log_queue_mutex);
+    size_t n = 0;
+    while (n < max && g_log_queue_count > 0) {
+        out[n++] = g_log_queue[g_log_queue_head];
+        g_log_queue_head = (g_log_queue_head + 1) % LOG_QUEUE_CAPACITY;
+        --g_log_queue_count;
+    }
+    if (n < max && g_log_queue_count == 0 && g_log_queue_dropped > 0) {
+        out[n].level = DOF_LOG_WARN;
+        snprintf(out[n].message, sizeof(out[n].message),
+                 "dof_c_api: log queue full, %zu message(s) dropped",
+                 g_log_queue_dropped);
+        g_log_queue_dropped = 0;
+        ++n;
+    }
+    return n;
+}
+
 void* dof_create(void)
 {
     return new DOF::DOF();
@@ -98,6 +174,13 @@ void dof_data_receive(void* dof, char type, int number, int value)
     static_cast<DOF::DOF*>(dof)->DataReceive(type, number, value);
 }
 
+void dof_data_receive_batch(void* dof, const DofEvent* events, size_t count)
+{
+    DOF::DOF* d = static_cast<DOF::DOF*>(dof);
+    for (size_t i = 0; i < count; ++i)
+        d->DataReceive(events[i].type, events[i].number, events[i].value);
+}
+
 void dof_finish(void* dof)
 {
     static_cast<DOF::DOF*>(dof)->Finish();
@@ -9,6 +9,9 @@
 
 #pragma once
 
+#include <stddef.h>
+#include <stdint.h>
+
 /* Export macro — functions must be explicitly exported on Windows DLLs */
 #ifdef _MSC_VER
 #  define DOF_PYTHON_API __declspec(dllexport)
@@ -37,6 +40,28 @@ typedef enum {
  */
 typedef void (*DofLogCallbackC)(DofLogLevel level, const char* message);
 
+/** Maximum stored length (including the NUL) of a queued log message. */
+#define DOF_LOG_MESSAGE_MAX 512
+
+/**
+ * One log message drained with dof_log_drain().
+ * Messages longer than DOF_LOG_MESSAGE_MAX - 1 bytes are truncated.
+ */
+typedef struct {
+    int  level;                          /* a DofLogLevel value */
+    char message[DOF_LOG_MESSAGE_MAX];
+} DofLogRecord;
+
+/**
+ * One game event for dof_data_receive_batch().
+ * Fields have the same meaning as the dof_data_receive() arguments.
+ */
+typedef struct {
+    char    type;
+    int32_t number;
+    int32_t value;
+} DofEvent;
+
 
 /* ------------------------------------------------------------------ */
 /* Global configuration (wraps DOF::Config singleton)                  */
@@ -58,6 +83,24 @@ DOF_PYTHON_API void dof_config_set_log_level(DofLogLevel level);
  */
 DOF_PYTHON_API void dof_config_set_log_callback(DofLogCallbackC callback);
 
+/**
+ * Queue log messages in a fixed-size ring buffer instead of (or as well as)
+ * calling the log callback, so the logging thread never has to enter
+ * Python.  Pass 0 to stop queueing; already queued messages stay drainable
+ * and no message is queued after this returns.  Re-enabling starts with an
+ * empty queue.
+ * When the ring is full new messages are dropped and counted.
+ */
+DOF_PYTHON_API void dof_config_set_log_queue(int enabled);
+
+/**
+ * Move up to max queued log messages into out, oldest first.
+ * Returns the number of records written.  Safe to call from any thread.
+ * If messages were dropped since the last drain, a DOF_LOG_WARN record
+ * saying how many is appended.
+ */
+DOF_PYTHON_API size_t dof_log_drain(DofLogRecord* out, size_t max);
+
 
 /* ------------------------------------------------------------------ */
 /* DOF instance lifecycle                                              */
@@ -93,6 +136,13 @@ DOF_PYTHON_API void dof_init(void* dof, const char* table_filename, const char*
  */
 DOF_PYTHON_API void dof_data_receive(void* dof, char type, int number, int value);
 
+/**
+ * Send several game events to DOF in one call, in array order.
+ * Equivalent to calling dof_data_receive() once per element, but crosses
+ * the Python/C boundary only once.
+ */
+DOF_PYTHON_API void dof_data_receive_batch(void* dof, const DofEvent* events, size_t count);
+
 /**
  * Finish/reset the current DOF session.
  * Call when the table session ends. You can call dof_init() again
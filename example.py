@@ -9,18 +9,21 @@ import re
 import select
 import sys
 import threading
+import time
 
 import dof
 
 
+_LOG_TAGS = {
+    dof.LogLevel.INFO: '[INFO ]',
+    dof.LogLevel.WARN: '[WARN ]',
+    dof.LogLevel.ERROR: '[ERROR]',
+    dof.LogLevel.DEBUG: '[DEBUG]',
+}
+
+
 def log_handler(level: dof.LogLevel, message: str) -> None:
-    tag = {
-        dof.LogLevel.INFO: '[INFO ]',
-        dof.LogLevel.WARN: '[WARN ]',
-        dof.LogLevel.ERROR: '[ERROR]',
-        dof.LogLevel.DEBUG: '[DEBUG]',
-    }.get(level, '[?????]')
-    print(f'{tag} {message}')
+    print(f'{_LOG_TAGS.get(level, "[?????]")} {message}')
 
 
 def _default_base_path() -> str:
@@ -58,6 +61,25 @@ def _wait_for_quit_key() -> None:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
 
 
+def _wait_until_or_stop(stop_event: threading.Event, deadline_mono: float) -> bool:
+    while not stop_event.is_set():
+        remaining = deadline_mono - time.monotonic()
+        if remaining <= 0:
+            return False
+        stop_event.wait(timeout=min(remaining, 0.05))
+    return True
+
+
+def _next_deadline(deadline_mono: float, step_sec: float) -> float:
+    """Advance a deadline by step_sec.  Only when the loop is more than a whole
+    step behind (e.g. after Ctrl-Z or suspend) does it restart from now, so
+    missed steps are not fired back to back."""
+    now = time.monotonic()
+    if now - deadline_mono > step_sec:
+        deadline_mono = now
+    return deadline_mono + step_sec
+
+
 def _run_random_e_effects(
     d: dof.DOF,
     stop_event: threading.Event,
@@ -67,16 +89,21 @@ def _run_random_e_effects(
     interval_sec: float,
 ) -> None:
     last_number: int | None = None
+    # Absolute deadlines, so per-event overhead does not accumulate as drift.
+    deadline = time.monotonic()
     try:
-        while not stop_event.wait(interval_sec):
+        while True:
+            deadline = _next_deadline(deadline, interval_sec)
+            if _wait_until_or_stop(stop_event, deadline):
+                break
             number = random.randint(random_min, random_max)
             if last_number is not None:
-                d.data_receive('E', last_number, 0)
-            d.data_receive('E', number, on_value)
+                d.send_str('E', last_number, 0)
+            d.send_str('E', number, on_value)
             last_number = number
     finally:
         if last_number is not None:
-            d.data_receive('E', last_number, 0)
+            d.send_str('E', last_number, 0)
 
 
 def _parse_trigger_tokens(token_expr: str) -> list[tuple[str, int]]:
@@ -178,27 +205,30 @@ def _run_token_sequence(
     off_sec: float,
     loop: bool,
 ) -> None:
+    # Absolute deadlines, so per-event overhead does not accumulate as drift.
+    deadline = time.monotonic()
     try:
         while not stop_event.is_set():
             for type_char, number in tokens:
                 if stop_event.is_set():
                     return
-                d.data_receive(type_char, number, on_value)
-                if stop_event.wait(on_sec):
-                    d.data_receive(type_char, number, 0)
+                d.send_str(type_char, number, on_value)
+                deadline = _next_deadline(deadline, on_sec)
+                if _wait_until_or_stop(stop_event, deadline):
+                    d.send_str(type_char, number, 0)
                     return
-                d.data_receive(type_char, number, 0)
-                if stop_event.wait(off_sec):
+                d.send_str(type_char, number, 0)
+                deadline = _next_deadline(deadline, off_sec)
+                if _wait_until_or_stop(stop_event, deadline):
                     return
             if not loop:
                 return
     finally:
         # Best-effort cleanup: force all parsed events OFF.
-        for type_char, number in tokens:
-            try:
-                d.data_receive(type_char, number, 0)
-            except Exception:
-                pass
+        try:
+            d.data_receive_many([(type_char, number, 0) for type_char, number in tokens])
+        except Exception:
+            pass
 
 
 def _run_event_range_sequence(
@@ -212,27 +242,30 @@ def _run_event_range_sequence(
     off_sec: float,
     loop: bool,
 ) -> None:
+    # Absolute deadlines, so per-event overhead does not accumulate as drift.
+    deadline = time.monotonic()
     try:
         while not stop_event.is_set():
             for number in range(start_number, end_number + 1):
                 if stop_event.is_set():
                     return
-                d.data_receive(type_char, number, on_value)
-                if stop_event.wait(on_sec):
-                    d.data_receive(type_char, number, 0)
+                d.send_str(type_char, number, on_value)
+                deadline = _next_deadline(deadline, on_sec)
+                if _wait_until_or_stop(stop_event, deadline):
+                    d.send_str(type_char, number, 0)
                     return
-                d.data_receive(type_char, number, 0)
-                if stop_event.wait(off_sec):
+                d.send_str(type_char, number, 0)
+                deadline = _next_deadline(deadline, off_sec)
+                if _wait_until_or_stop(stop_event, deadline):
                     return
             if not loop:
                 return
     finally:
         # Best-effort cleanup: force the full range OFF.
-        for number in range(start_number, end_number + 1):
-            try:
-                d.data_receive(type_char, number, 0)
-            except Exception:
-                pass
+        try:
+            d.data_receive_many([(type_char, number, 0) for number in range(start_number, end_number + 1)])
+        except Exception:
+            pass
 
 
 def _parse_event_arg(event_text: str) -> tuple[str, int]:
@@ -403,7 +436,9 @@ def main() -> None:
     if args.range_on_value < 0:
         parser.error('--range-on-value must be >= 0')
 
-    dof.set_log_callback(log_handler)
+    # Buffered: libdof queues messages in C and log_handler runs on dof.py's
+    # drain thread, so printing never blocks libdof's own threads.
+    dof.set_log_callback(log_handler, buffered=True)
     dof.set_log_level(dof.LogLevel.DEBUG if args.debug else dof.LogLevel.INFO)
     dof.set_base_path(args.base_path if args.base_path else _default_base_path())
 
@@ -422,11 +457,11 @@ def main() -> None:
                 f'event={type_char}{number}, on_value={args.event_on_value}, '
                 f'on_sec={args.event_on_sec:.3f}'
             )
-            d.data_receive(type_char, number, args.event_on_value)
+            d.send_str(type_char, number, args.event_on_value)
             try:
                 threading.Event().wait(args.event_on_sec)
             finally:
-                d.data_receive(type_char, number, 0)
+                d.send_str(type_char, number, 0)
                 d.finish()
             print('Done.')
             return
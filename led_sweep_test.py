@@ -59,6 +59,11 @@ def main() -> None:
         help="ON value sent for each LED event (default: 1)",
     )
     parser.add_argument("--debug", action="store_true", help="Enable DEBUG-level logging")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print the ON/OFF line for each LED number",
+    )
     args = parser.parse_args()
 
     if args.start < 0:
@@ -91,13 +96,15 @@ def main() -> None:
     with dof.DOF() as d:
         d.init(rom_key)
         for number in range(args.start, args.end + 1):
-            print(f"ON  {event_type}{number}")
+            if not args.quiet:
+                print(f"ON  {event_type}{number}")
             d.data_receive(event_type, number, args.on_value)
             try:
                 time.sleep(args.hold_sec)
             finally:
                 d.data_receive(event_type, number, 0)
-            print(f"OFF {event_type}{number}")
+            if not args.quiet:
+                print(f"OFF {event_type}{number}")
 
     print("Done.")
 
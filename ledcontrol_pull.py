@@ -1,25 +1,39 @@
 #!/usr/bin/env python3
 import argparse
+import configparser
+import contextlib
+import http.client
 import os
 import sys
 import tempfile
+import time
 import platform
 import subprocess
 import re
-import requests
+import shutil
+import ssl
 import zipfile
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.request import HTTPCookieProcessor, HTTPSHandler, OpenerDirector, Request, build_opener
+
+try:
+    import certifi
+except ImportError:               # Optional: fall back to the system CA store
+    certifi = None
+
+HOME = os.path.expanduser('~')
 
 
 def _default_base_path() -> str:
     """Return the platform-specific default VPinballX 10.8 directoutputconfig directory."""
-    home = os.path.expanduser('~')
     if sys.platform == 'win32':
-        appdata = os.environ.get('APPDATA', home)
+        appdata = os.environ.get('APPDATA', HOME)
         return os.path.join(appdata, 'VPinballX', '10.8', 'directoutputconfig')
     elif sys.platform == 'darwin':
-        return os.path.join(home, 'Library', 'Application Support', 'VPinballX', '10.8', 'directoutputconfig')
+        return os.path.join(HOME, 'Library', 'Application Support', 'VPinballX', '10.8', 'directoutputconfig')
     else:  # Linux / other POSIX
-        return os.path.join(home, '.local', 'share', 'VPinballX', '10.8', 'directoutputconfig')
+        return os.path.join(HOME, '.local', 'share', 'VPinballX', '10.8', 'directoutputconfig')
 
 VERSION = "2.0"
 
@@ -43,45 +57,45 @@ def iif(cond, a, b):
     return a if cond else b
 
 
-def ensure_ini(file_path: str) -> None:
-    """Create the INI with a zero version marker if it does not exist."""
-    if not os.path.exists(file_path):
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write('[version]\nversion=0\n')
+def write_ini_version(file_path: str, version: int) -> None:
+    """
+    Atomically store the config version: write a temp file next to the INI
+    and rename it over the original, so an interrupted run never leaves a
+    truncated INI behind.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(f'[version]\nversion={version}\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
 
 
 def read_ini(file_path, section, key):
     """
-    Compatible with VBS ReadIni behavior
+    Look up key in section.  Like VBS ReadIni, names are case-insensitive,
+    a missing file, section or key reads as "", and malformed lines are
+    skipped.  Unlike it, a repeated key returns its last value, indented
+    lines continue the previous value, and a file that does not start with
+    a section header reads as empty.
     """
-    if not os.path.exists(file_path):
+    cp = configparser.ConfigParser(interpolation=None, strict=False, delimiters=("=",))
+    cp.optionxform = str.lower
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            cp.read_file(f)
+    except configparser.MissingSectionHeaderError:
+        return ""
+    except configparser.ParsingError:
+        pass                # cp still holds every line that did parse
+    except (OSError, configparser.Error):
         return ""
 
     section = section.lower()
-    key = key.lower()
-
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        lines = f.readlines()
-
-    in_section = False
-    for line in lines:
-        line = line.strip()
-
-        if line.lower() == f"[{section}]":
-            in_section = True
-            continue
-
-        if in_section:
-            if line.startswith("["):
-                break
-
-            if "=" in line:
-                k, v = line.split("=", 1)
-                if k.strip().lower() == key:
-                    v = v.strip()
-                    return v if v else " "
-
+    for name in cp.sections():
+        if name.lower() == section:
+            return cp.get(name, key.lower(), fallback="")
     return ""
 
 
@@ -135,7 +149,69 @@ def _sanitize_headers(headers_map):
     return sanitized
 
 
-def _response_preview(response: requests.Response, limit: int = 300) -> str:
+class HttpResponse:
+    """The parts of a urllib response the pull steps and debug output use."""
+
+    def __init__(self, request: Request, raw, elapsed_sec: float) -> None:
+        self.request = request
+        self.raw = raw                    # Readable body stream
+        self.url = raw.geturl()
+        self.status_code = raw.getcode()
+        self.reason = raw.reason
+        self.headers = raw.headers
+        self.elapsed_sec = elapsed_sec
+        self._content = None
+
+    def close(self) -> None:
+        self.raw.close()
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = self.raw.read()
+        return self._content
+
+    @property
+    def text(self) -> str:
+        charset = self.headers.get_content_charset() or "utf-8"
+        return self.content.decode(charset, errors="replace")
+
+
+# Errors a urllib GET can raise besides an HTTP error status
+HTTP_ERRORS = (OSError, http.client.HTTPException)
+
+
+def build_http_opener() -> OpenerDirector:
+    """
+    Opener that keeps cookies between requests and verifies HTTPS against
+    certifi's CA bundle when installed (python.org macOS builds ship with
+    an empty system store until "Install Certificates.command" is run).
+    """
+    cafile = certifi.where() if certifi is not None else None
+    context = ssl.create_default_context(cafile=cafile)
+    return build_opener(HTTPCookieProcessor(CookieJar()), HTTPSHandler(context=context))
+
+
+def print_ssl_hint(error: BaseException) -> None:
+    """Explain how to fix certificate errors, which urllib wraps in URLError."""
+    if isinstance(error, ssl.SSLError) or isinstance(getattr(error, "reason", None), ssl.SSLError):
+        print("   Hint: TLS error. For CERTIFICATE_VERIFY_FAILED install certifi "
+              "(pip install certifi) or, on macOS, run \"Install Certificates.command\" "
+              "from your Python folder.")
+
+
+def http_get(opener: OpenerDirector, url: str, timeout: float) -> HttpResponse:
+    """GET url with the shared headers; HTTP error statuses are returned, not raised."""
+    request = Request(url, headers=headers)
+    started = time.monotonic()
+    try:
+        raw = opener.open(request, timeout=timeout)
+    except HTTPError as e:
+        raw = e
+    return HttpResponse(request, raw, time.monotonic() - started)
+
+
+def _response_preview(response: HttpResponse, limit: int = 300) -> str:
     try:
         body = response.text
     except Exception as e:
@@ -147,18 +223,19 @@ def _response_preview(response: requests.Response, limit: int = 300) -> str:
     return body
 
 
-def debug_http_response(label: str, response: requests.Response) -> None:
+def debug_http_response(label: str, response: HttpResponse) -> None:
+    if not param_debug:
+        # Skip building the body preview, which would buffer a streamed download.
+        return
     debug(f"** HTTP DEBUG [{label}]")
-    debug(f"request.method = {response.request.method}")
-    debug(f"request.url = {response.request.url}")
-    debug(f"request.headers = {_sanitize_headers(dict(response.request.headers))}")
+    debug(f"request.method = {response.request.get_method()}")
+    debug(f"request.url = {response.request.full_url}")
+    debug(f"request.headers = {_sanitize_headers(dict(response.request.header_items()))}")
     debug(f"response.url = {response.url}")
     debug(f"response.status = {response.status_code} {response.reason}")
-    debug(f"response.elapsed_ms = {int(response.elapsed.total_seconds() * 1000)}")
+    debug(f"response.elapsed_ms = {int(response.elapsed_sec * 1000)}")
     debug(f"response.headers = {_sanitize_headers(dict(response.headers))}")
-    debug(f"response.history_count = {len(response.history)}")
-    for idx, h in enumerate(response.history, start=1):
-        debug(f"response.history[{idx}] = {h.status_code} {h.reason} -> {h.url}")
+    debug(f"response.redirected = {response.url != response.request.full_url}")
     debug(f"response.body.preview = {_response_preview(response)}")
 
 
@@ -247,7 +324,6 @@ if param_debug:
     print("target =", param_directoutputconfigpath)
     print("platform =", platform.platform())
     print("python =", sys.version.replace("\n", " "))
-    print("requests =", requests.__version__)
 
 
 # -------------------------------------------------
@@ -273,7 +349,7 @@ if not os.path.isdir(param_directoutputconfigpath):
 # Always fetch the online version (needed for INI update after download too)
 # -------------------------------------------------
 status("Retrieving online version...")
-session = None
+opener = None
 if sys.platform == "win32":
     try:
         online_version = _windows_get_online_version(param_apikey)
@@ -282,26 +358,30 @@ if sys.platform == "win32":
         print(f"** Failed to retrieve online version: {e}")
         sys.exit(1)
 else:
-    session = requests.Session()
-    session.headers.update(headers)
+    # One opener for every request so cookies carry over between them.
+    opener = build_http_opener()
 
     # Preflight homepage hit to establish any bot/WAF cookies before API calls.
     try:
-        preflight = session.get(site_root_url, timeout=20)
-        debug_http_response("preflight", preflight)
-    except requests.RequestException as e:
+        with contextlib.closing(http_get(opener, site_root_url, timeout=20)) as preflight:
+            debug_http_response("preflight", preflight)
+    except HTTP_ERRORS as e:
         debug(f"** Preflight request failed: {type(e).__name__}: {e}")
 
     try:
-        r = session.get(version_url, timeout=20)
-    except requests.RequestException as e:
+        r = http_get(opener, version_url, timeout=20)
+        # Read the body here too: http_get() returns once the headers arrive.
+        with contextlib.closing(r):
+            version_text = r.text.strip()
+    except HTTP_ERRORS as e:
         print(f"** Failed to retrieve online version: {type(e).__name__}: {e}")
+        print_ssl_hint(e)
         sys.exit(1)
 
     debug_http_response("version", r)
 
-    if r.status_code == 200 and r.text.strip().isdigit():
-        online_version = int(r.text.strip())
+    if r.status_code == 200 and version_text.isdigit():
+        online_version = int(version_text)
         status(f"Online version retrieved: {online_version}")
     else:
         print("** Failed to retrieve online version.")
@@ -317,7 +397,6 @@ if param_debug or param_verbose:
 # Version check
 # -------------------------------------------------
 ini_file = os.path.join(os.path.dirname(param_directoutputconfigpath), "dofconfigversion.ini")
-ensure_ini(ini_file)
 
 bDoDownload = False
 
@@ -327,7 +406,8 @@ else:
     if param_debug or param_verbose:
         print("**** Checking INI Version ****")
 
-    ini_version = read_ini(ini_file, "version", "version")
+    # No INI yet (first run) means version 0
+    ini_version = read_ini(ini_file, "version", "version") if os.path.exists(ini_file) else 0
     try:
         ini_version = int(ini_version)
     except:
@@ -365,22 +445,32 @@ if bDoDownload:
                 sys.exit(1)
         else:
             try:
-                r = session.get(download_url, stream=True, timeout=40)
-            except requests.RequestException as e:
+                r = http_get(opener, download_url, timeout=40)
+            except HTTP_ERRORS as e:
                 print(f"** Failed download: {type(e).__name__}: {e}")
+                print_ssl_hint(e)
                 sys.exit(1)
 
-            debug_http_response("download", r)
-
-            if r.status_code == 200:
-                with open(zip_path, "wb") as f:
-                    for chunk in r.iter_content(8192):
-                        f.write(chunk)
-                status("Successful download.")
-            else:
-                print(f"** Failed download (HTTP {r.status_code}).")
-                print(f"   Response preview: {_response_preview(r, limit=200)}")
-                sys.exit(1)
+            with contextlib.closing(r):
+                try:
+                    debug_http_response("download", r)
+
+                    if r.status_code == 200:
+                        with open(zip_path, "wb") as f:
+                            if param_debug:
+                                # The debug body preview has already buffered the response.
+                                f.write(r.content)
+                            else:
+                                shutil.copyfileobj(r.raw, f, 1 << 20)
+                        status("Successful download.")
+                    else:
+                        print(f"** Failed download (HTTP {r.status_code}).")
+                        print(f"   Response preview: {_response_preview(r, limit=200)}")
+                        sys.exit(1)
+                except HTTP_ERRORS as e:
+                    print(f"** Failed download: {type(e).__name__}: {e}")
+                    print_ssl_hint(e)
+                    sys.exit(1)
 
         if not os.path.exists(zip_path):
             print("** Failed download: archive file was not created.")
@@ -409,22 +499,26 @@ if bDoDownload:
             print("From:", zip_path)
             print("To:", param_directoutputconfigpath)
 
+        # Bound once: the loop runs per archive member.
+        join, dirname, makedirs = os.path.join, os.path.dirname, os.makedirs
+        created_dirs = set()
         with zipfile.ZipFile(zip_path, "r") as z:
             for member in z.infolist():
-                dest = os.path.join(param_directoutputconfigpath, member.filename)
-                if member.is_dir():
-                    os.makedirs(dest, exist_ok=True)
-                else:
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
+                dest = join(param_directoutputconfigpath, member.filename)
+                # Directory entries end with "/", so dirname() is the directory itself.
+                dest_dir = dirname(dest)
+                if dest_dir not in created_dirs:
+                    makedirs(dest_dir, exist_ok=True)
+                    created_dirs.add(dest_dir)
+                if not member.is_dir():
                     with z.open(member) as src, open(dest, "wb") as out:
-                        out.write(src.read())
+                        shutil.copyfileobj(src, out, 64 * 1024)
     finally:
         if os.path.exists(zip_path):
             os.remove(zip_path)
 
     # Update stored version in INI
-    with open(ini_file, 'w') as f:
-        f.write(f'[version]\nversion={online_version}\n')
+    write_ini_version(ini_file, online_version)
 
     status(f"Done: config updated to v{online_version}.")
 else:
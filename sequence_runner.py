@@ -2,7 +2,9 @@
 """Run named DOF timelines from JSON and switch between them."""
 
 import argparse
+import ctypes
 import glob
+import itertools
 import json
 import os
 import re
@@ -30,6 +32,13 @@ class Sequence:
     actions: list[Action]
 
 
+@dataclass(frozen=True)
+class Step:
+    at_ms: int
+    events: ctypes.Array                   # packed with dof.pack_events()
+    touched: tuple[tuple[str, int], ...]
+
+
 def log_handler(level: dof.LogLevel, message: str) -> None:
     tag = {
         dof.LogLevel.INFO: '[INFO ]',
@@ -266,10 +275,24 @@ def _wait_until_or_stop(stop_event: threading.Event, deadline_mono: float) -> bo
     return True
 
 
+def _build_steps(seq: Sequence) -> list[Step]:
+    """Group actions sharing an at_ms into one pre-packed batch."""
+    steps: list[Step] = []
+    for at_ms, group in itertools.groupby(seq.actions, key=lambda a: a.at_ms):
+        actions = list(group)
+        steps.append(Step(
+            at_ms=at_ms,
+            events=dof.pack_events((a.type_char, a.number, a.value) for a in actions),
+            touched=tuple((a.type_char, a.number) for a in actions),
+        ))
+    return steps
+
+
 class SequenceEngine:
     def __init__(self, d: dof.DOF, sequences: dict[str, Sequence]) -> None:
         self._dof = d
         self._sequences = sequences
+        self._steps = {name: _build_steps(seq) for name, seq in sequences.items()}
         self._lock = threading.Lock()
         self._stop_event = threading.Event()
         self._worker: threading.Thread | None = None
@@ -309,17 +332,17 @@ class SequenceEngine:
         self._all_off()
 
     def _all_off(self) -> None:
-        for type_char, number in list(self._touched):
-            self._dof.data_receive(type_char, number, 0)
+        if self._touched:
+            self._dof.data_receive_many([(type_char, number, 0) for type_char, number in self._touched])
         self._touched.clear()
 
     def _run_cycle(self, seq: Sequence, cycle_start_mono: float, stop_event: threading.Event) -> bool:
-        for action in seq.actions:
-            deadline = cycle_start_mono + (action.at_ms / 1000.0)
+        for step in self._steps[seq.name]:
+            deadline = cycle_start_mono + (step.at_ms / 1000.0)
             if _wait_until_or_stop(stop_event, deadline):
                 return False
-            self._dof.data_receive(action.type_char, action.number, action.value)
-            self._touched.add((action.type_char, action.number))
+            self._dof.data_receive_many(step.events)
+            self._touched.update(step.touched)
         return True
 
     def _run(self, seq: Sequence, stop_event: threading.Event) -> None: